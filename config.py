@@ -34,6 +34,12 @@ WHEEL_DIAMETER_MM = 56
 # Distance between wheel centers. This is robot-dependent; tune for accurate turns.
 AXLE_TRACK_MM = 114
 
+# DriveBase.settings() for straight()/turn() maneuvers.
+DRIVE_STRAIGHT_SPEED = 200
+DRIVE_STRAIGHT_ACCEL = 400
+DRIVE_TURN_RATE = 250
+DRIVE_TURN_ACCEL = 400
+
 # ------------------------------
 # Line / surface calibration (tune REQUIRED)
 # ------------------------------
@@ -61,6 +67,22 @@ MIN_LINE_STRENGTH = 0.12
 # Loop timing
 CONTROL_LOOP_MS = 10
 
+# ------------------------------
+# Background sensor acquisition (optional)
+# ------------------------------
+
+# If True, a _thread worker samples the sensors and the control loop reads the latest snapshot
+# (sensor_thread is only imported then, so firmware without _thread runs with False).
+ENABLE_SENSOR_THREAD = False
+
+# Color sensors are sampled every loop of the worker; the ultrasonic sensor less often.
+SENSOR_COLOR_PERIOD_MS = 2
+SENSOR_ULTRA_PERIOD_MS = 50
+
+# Snapshot data older than this (ultrasonic: SENSOR_ULTRA_PERIOD_MS + this) is stale;
+# Robot's read accessors then read the sensor inline instead.
+SENSOR_STALE_MS = 40
+
 # ------------------------------
 # State machine timing (tune)
 # ------------------------------
@@ -91,6 +113,11 @@ SHORT_RIGHT_TRY_DEG = 25
 SHORT_TRY_FORWARD_MM = 35
 SHORT_TRY_MS = 250
 
+# Preallocated DFS stack size (one byte per open intersection on the current path).
+# Hard limit: a deeper path raises IndexError("DFS stack full") and ends the run.
+# The list-based stack had no limit; raise this for very large mazes (1 byte each).
+DFS_STACK_CAPACITY = 128
+
 # ------------------------------
 # Center sensor (Color mode) classification
 # ------------------------------
@@ -141,6 +168,33 @@ PICKUP_CONFIRM_COUNT = 3
 # Drop behavior: drop the carried object on the first blue node after pickup.
 DROP_ON_NODE_RED = True
 
+# ------------------------------
+# Delivery route planning (optional)
+# ------------------------------
+
+# If True, the first run only maps the maze (objects are recorded, not picked up, and GREEN
+# does not stop the run). When exploration is complete, all objects are delivered to RED
+# nodes along a planned shortest route, ending on GREEN if it was found.
+ENABLE_ROUTE_PLAN = False
+
+# Up to this many objects the pickup order / drop assignment is exact; beyond it, heuristic.
+PLAN_EXACT_MAX = 7
+
+# ------------------------------
+# Map-aware speed profile (route mode only)
+# ------------------------------
+
+# If True, corridors with a recorded length are driven faster than BASE_SPEED:
+# accelerate from the previous vertex, brake back to BASE_SPEED before the next junction.
+# Ramps use DRIVE_STRAIGHT_ACCEL so commanded speeds stay within the DriveBase limits.
+ENABLE_SPEED_PROFILE = False
+
+# mm/s cap on known corridors.
+PROFILE_MAX_SPEED = 320
+
+# Be back at BASE_SPEED this far before the recorded junction (odometry error + detection).
+PROFILE_BRAKE_MARGIN_MM = 120
+
 # ------------------------------
 # Gripper configuration (tune)
 # ------------------------------
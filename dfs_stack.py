@@ -0,0 +1,141 @@
+"""
+Compact DFS exploration state backed by a preallocated bytearray.
+
+One byte per junction, no per-junction Python objects:
+- bits 0..3: remaining branches (bit n set => direction code n still to explore)
+- bits 4..5: branch taken when leaving the junction (direction code)
+- bit 6:     junction kind (KIND_T / KIND_PLUS)
+
+Directions are integer codes in quarter turns, relative to the heading the junction
+was first entered with. This module has no pybricks dependency so it also runs on a host.
+
+All comments are intentionally in English (per user rule).
+"""
+
+# Direction codes (quarter turns clockwise).
+DIR_S = 0
+DIR_R = 1
+DIR_B = 2
+DIR_L = 3
+
+DIR_NAMES = "SRBL"
+
+# Junction kinds.
+KIND_T = 0
+KIND_PLUS = 1
+
+# Remaining-branch masks.
+BIT_S = 1 << DIR_S
+BIT_R = 1 << DIR_R
+BIT_L = 1 << DIR_L
+
+# Exploration priority: Right -> Straight -> Left
+_PRIORITY = (DIR_R, DIR_S, DIR_L)
+
+_MASK_BITS = 0x0F
+_TAKEN_SHIFT = 4
+_KIND_SHIFT = 6
+
+
+def heading_after(current: int, turn: int) -> int:
+    # Heading in the junction's entry frame after applying a relative turn.
+    return (current + turn) & 3
+
+
+def relative_turn(current: int, target: int) -> int:
+    # Turn that points the robot from current to target (both in the entry frame).
+    return (target - current) & 3
+
+
+def expected_state(kind: int, arrival: int) -> int:
+    """
+    Line state predicted at the center of a known junction, as classify_intersection sees it:
+    [L, C, R] bits are set for branches to the left / straight ahead / right of the robot.
+    arrival is the robot's heading in the junction's entry frame.
+    """
+    present = (BIT_L | BIT_S | BIT_R | (1 << DIR_B)) if kind == KIND_PLUS else (BIT_L | BIT_R | (1 << DIR_B))
+    l = (present >> heading_after(arrival, DIR_L)) & 1
+    c = (present >> heading_after(arrival, DIR_S)) & 1
+    r = (present >> heading_after(arrival, DIR_R)) & 1
+    return (l << 2) | (c << 1) | r
+
+
+def take_first(mask: int):
+    """
+    Pick the highest-priority branch from mask.
+    Returns (direction, remaining_mask), or (-1, mask) if mask is empty.
+    """
+    for d in _PRIORITY:
+        bit = 1 << d
+        if mask & bit:
+            return d, mask & ~bit
+    return -1, mask
+
+
+def backtrack_step(stack):
+    """
+    Decision on a backtracking arrival at the junction on top of stack.
+
+    The robot returns along the stored taken branch, so it arrives facing the opposite way.
+    Take the next remaining branch (it becomes the new taken branch), or pop the junction
+    and head back toward where it was first entered.
+    Returns (arrival, target, turn, backtracking); arrival / target are in the entry frame.
+    """
+    arrival = heading_after(stack.taken(), DIR_B)
+    target = stack.pop_option()
+    if target >= 0:
+        stack.set_taken(target)
+        backtracking = False
+    else:
+        stack.pop()
+        target = DIR_B
+        backtracking = True
+    return arrival, target, relative_turn(arrival, target), backtracking
+
+
+class DfsStack:
+    def __init__(self, capacity: int):
+        self._buf = bytearray(int(capacity))
+        self._n = 0
+
+    def __len__(self) -> int:
+        return self._n
+
+    def clear(self) -> None:
+        self._n = 0
+
+    def push(self, kind: int, remaining: int, taken: int) -> None:
+        # Capacity is a hard limit (config.DFS_STACK_CAPACITY): overflowing ends the run.
+        if self._n >= len(self._buf):
+            raise IndexError("DFS stack full")
+        self._buf[self._n] = (int(kind) << _KIND_SHIFT) | ((int(taken) & 3) << _TAKEN_SHIFT) | (int(remaining) & _MASK_BITS)
+        self._n += 1
+
+    def pop(self) -> None:
+        if self._n > 0:
+            self._n -= 1
+
+    def kind(self) -> int:
+        return (self._buf[self._n - 1] >> _KIND_SHIFT) & 1
+
+    def taken(self) -> int:
+        return (self._buf[self._n - 1] >> _TAKEN_SHIFT) & 3
+
+    def set_taken(self, taken: int) -> None:
+        i = self._n - 1
+        self._buf[i] = (self._buf[i] & ~(3 << _TAKEN_SHIFT)) | ((int(taken) & 3) << _TAKEN_SHIFT)
+
+    def remaining(self) -> int:
+        return self._buf[self._n - 1] & _MASK_BITS
+
+    def pop_option(self) -> int:
+        """
+        Remove and return the highest-priority remaining branch of the top junction.
+        Returns -1 if it has none left.
+        """
+        i = self._n - 1
+        b = self._buf[i]
+        d, rest = take_first(b & _MASK_BITS)
+        if d >= 0:
+            self._buf[i] = (b & ~_MASK_BITS) | rest
+        return d
@@ -0,0 +1,223 @@
+"""
+Host-side stress run for the DFS exploration state.
+
+Explores a random tree maze with thousands of simulated junctions twice:
+- with the previous list-of-dicts stack (string options, list.pop(0)),
+- with dfs_stack.DfsStack (one packed byte per junction, integer direction codes),
+checks that both make the same decisions, and reports peak memory and GC count.
+
+Run with CPython on a PC (no pybricks needed):
+    python dfs_stress.py --junctions 5000
+
+All comments are intentionally in English (per user rule).
+"""
+
+import argparse
+import gc
+import random
+import sys
+import tracemalloc
+
+from dfs_stack import (
+    BIT_L,
+    BIT_R,
+    BIT_S,
+    DIR_B,
+    DIR_L,
+    DIR_R,
+    DIR_S,
+    KIND_PLUS,
+    KIND_T,
+    DfsStack,
+    backtrack_step,
+    take_first,
+)
+
+# Branch slot values in the simulated maze.
+_NO_BRANCH = -2
+_DEAD_END = -1
+
+_NAME_TO_DIR = {"S": DIR_S, "R": DIR_R, "B": DIR_B, "L": DIR_L}
+_DIR_TO_NAME = "SRBL"
+
+
+class _SimMaze:
+    """
+    Random tree maze. children[node * 4 + d] is the junction reached through branch d
+    (entry-frame direction code), _DEAD_END, or _NO_BRANCH.
+    """
+
+    def __init__(self, junctions: int, seed: int, dead_end_prob: float, depth_bias: float):
+        rng = random.Random(seed)
+        self.kinds = []
+        self.children = []
+        self.parent = []
+
+        frontier = []
+        self._add(rng, -1, frontier)
+        while frontier:
+            # Extending the newest slot makes long corridors (deep stack); a random one makes it bushy.
+            if rng.random() >= depth_bias:
+                i = rng.randrange(len(frontier))
+                frontier[i], frontier[-1] = frontier[-1], frontier[i]
+            slot = frontier.pop()
+            if len(self.kinds) < junctions and rng.random() >= dead_end_prob:
+                self.children[slot] = self._add(rng, slot // 4, frontier)
+            elif len(self.kinds) < junctions and not frontier:
+                # Never let the maze close before reaching the requested size.
+                self.children[slot] = self._add(rng, slot // 4, frontier)
+            else:
+                self.children[slot] = _DEAD_END
+
+    def _add(self, rng, parent: int, frontier) -> int:
+        node = len(self.kinds)
+        kind = KIND_PLUS if rng.random() < 0.5 else KIND_T
+        self.kinds.append(kind)
+        self.parent.append(parent)
+        self.children.extend((_NO_BRANCH, _NO_BRANCH, _NO_BRANCH, _NO_BRANCH))
+        dirs = (DIR_R, DIR_S, DIR_L) if kind == KIND_PLUS else (DIR_R, DIR_L)
+        for d in dirs:
+            frontier.append(node * 4 + d)
+        return node
+
+
+class _ListPolicy:
+    # Previous representation: dict per junction with a list of option strings.
+
+    def __init__(self):
+        self.stack = []
+
+    def __len__(self) -> int:
+        return len(self.stack)
+
+    def explore(self, kind: int) -> int:
+        options = ["R", "S", "L"] if kind == KIND_PLUS else ["R", "L"]
+        chosen = options.pop(0)
+        self.stack.append({"kind": "PLUS" if kind == KIND_PLUS else "T", "options": options, "taken": chosen})
+        return _NAME_TO_DIR[chosen]
+
+    def backtrack(self):
+        entry = self.stack[-1]
+        arrival = _DIR_TO_NAME[(_NAME_TO_DIR[entry["taken"]] + 2) % 4]
+        if entry["options"]:
+            target = entry["options"].pop(0)
+            entry["taken"] = target
+            backtracking = False
+        else:
+            self.stack.pop()
+            target = "B"
+            backtracking = True
+        turn = (_NAME_TO_DIR[target] - _NAME_TO_DIR[arrival]) % 4
+        return turn, _NAME_TO_DIR[target], backtracking
+
+
+class _CompactPolicy:
+    # Current representation and decision code used by navigator.handle_intersection_dfs.
+
+    def __init__(self, capacity: int):
+        self.stack = DfsStack(capacity)
+
+    def __len__(self) -> int:
+        return len(self.stack)
+
+    def explore(self, kind: int) -> int:
+        mask = (BIT_L | BIT_S | BIT_R) if kind == KIND_PLUS else (BIT_L | BIT_R)
+        chosen, remaining = take_first(mask)
+        self.stack.push(kind, remaining, chosen)
+        return chosen
+
+    def backtrack(self):
+        # Same decision function as navigator._backtrack_known.
+        _, target, turn, backtracking = backtrack_step(self.stack)
+        return turn, target, backtracking
+
+
+def _explore(maze: _SimMaze, policy):
+    """
+    Run the full DFS over the maze.
+    Returns (decisions, checksum) where checksum folds every turn code in order.
+    """
+    children = maze.children
+    parent = maze.parent
+    decisions = 0
+    checksum = 0
+
+    node = 0
+    backtracking = False
+    while True:
+        if not backtracking:
+            chosen = policy.explore(maze.kinds[node])
+            decisions += 1
+            checksum = (checksum * 31 + chosen) & 0xFFFFFFFF
+            nxt = children[node * 4 + chosen]
+            if nxt >= 0:
+                node = nxt
+            else:
+                # Dead end (RED node): U-turn and come back to the same junction.
+                backtracking = True
+            continue
+
+        if len(policy) == 0:
+            break
+        turn, target, backtracking = policy.backtrack()
+        decisions += 1
+        checksum = (checksum * 31 + turn) & 0xFFFFFFFF
+        if backtracking:
+            node = parent[node]
+            if node < 0:
+                break
+        else:
+            nxt = children[node * 4 + target]
+            if nxt >= 0:
+                node = nxt
+            else:
+                backtracking = True
+
+    return decisions, checksum
+
+
+def _measure(maze: _SimMaze, policy):
+    # Peak traced memory (bytes) and number of GC runs for one exploration.
+    runs = [0]
+
+    def _on_gc(phase, info):
+        if phase == "start":
+            runs[0] += 1
+
+    gc.collect()
+    gc.callbacks.append(_on_gc)
+    tracemalloc.start()
+    try:
+        decisions, checksum = _explore(maze, policy)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        gc.callbacks.remove(_on_gc)
+    return decisions, checksum, peak, runs[0]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--junctions", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--dead-end-prob", type=float, default=0.35)
+    parser.add_argument("--depth-bias", type=float, default=0.9)
+    args = parser.parse_args(argv)
+
+    maze = _SimMaze(args.junctions, args.seed, args.dead_end_prob, args.depth_bias)
+    print(f"maze: {len(maze.kinds)} junctions")
+
+    results = []
+    for name, policy in (("list", _ListPolicy()), ("compact", _CompactPolicy(len(maze.kinds)))):
+        decisions, checksum, peak, gc_runs = _measure(maze, policy)
+        results.append(checksum)
+        print(f"{name:8s} decisions={decisions} peak={peak}B gc_runs={gc_runs} checksum={checksum:08x}")
+
+    if results[0] != results[1]:
+        print("MISMATCH: compact stack made different decisions")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
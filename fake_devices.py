@@ -0,0 +1,222 @@
+"""
+Host-side fake devices for running pieces of the control logic on a PC.
+
+- FakeColorSensor / FakeUltrasonicSensor: reads sleep for a configurable latency
+  to mimic the EV3 sensor round trip.
+- install_fake_pybricks(world): registers instrumented fake `pybricks.*` modules so
+  main.py can run unmodified. Time is simulated (wait() advances a clock instead of
+  sleeping) and every device call is counted by name in world.counter.
+
+All comments are intentionally in English (per user rule).
+"""
+
+import sys
+import time
+import types
+
+
+class CallCounter:
+    def __init__(self):
+        self.counts = {}
+
+    def hit(self, name: str) -> None:
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    def reset(self) -> None:
+        self.counts = {}
+
+
+class FakeColorSensor:
+    def __init__(self, latency_ms: float = 0.0, reflection: int = 50, color=None):
+        self.latency_ms = float(latency_ms)
+        self.value_reflection = int(reflection)
+        self.value_color = color
+
+    def _delay(self) -> None:
+        if self.latency_ms > 0:
+            time.sleep(self.latency_ms / 1000.0)
+
+    def reflection(self) -> int:
+        self._delay()
+        return self.value_reflection
+
+    def color(self):
+        self._delay()
+        return self.value_color
+
+
+class FakeUltrasonicSensor:
+    def __init__(self, latency_ms: float = 0.0, distance: int = 2550):
+        self.latency_ms = float(latency_ms)
+        self.value_distance = distance
+
+    def distance(self):
+        if self.latency_ms > 0:
+            time.sleep(self.latency_ms / 1000.0)
+        return self.value_distance
+
+
+# ------------------------------
+# Fake pybricks modules
+# ------------------------------
+
+
+class FakeWorld:
+    """
+    Shared state of the fake pybricks environment.
+
+    - clock_ms: simulated time, advanced by pybricks.tools.wait()
+    - odometer_mm / speed: DriveBase distance and commanded speed; wait() moves the
+      odometer at the drive() speed, straight() moves it at once
+    - counter: CallCounter for every device method
+    - reflections / colors: per color-sensor port values (keyed by Port name, e.g. "S1")
+    - distance: ultrasonic reading
+    - on_buttons: callable returning the list of pressed buttons; called before counting
+    """
+
+    def __init__(self):
+        self.clock_ms = 0
+        self.odometer_mm = 0.0
+        self.speed = 0
+        self.counter = CallCounter()
+        self.reflections = {}
+        self.colors = {}
+        self.distance = 2550
+        self.on_buttons = None
+
+
+class _Const:
+    def __init__(self, name: str):
+        self.name = name
+
+    def __repr__(self) -> str:
+        return self.name
+
+
+def _enum(name: str, members):
+    return type(name, (), {m: _Const(name + "." + m) for m in members})
+
+
+def install_fake_pybricks(world: FakeWorld) -> None:
+    counter = world.counter
+
+    Port = _enum("Port", ("A", "B", "C", "D", "S1", "S2", "S3", "S4"))
+    Color = _enum("Color", ("BLACK", "BLUE", "GREEN", "YELLOW", "RED", "WHITE", "BROWN"))
+    Stop = _enum("Stop", ("COAST", "BRAKE", "HOLD"))
+    Direction = _enum("Direction", ("CLOCKWISE", "COUNTERCLOCKWISE"))
+    Button = _enum("Button", ("LEFT", "RIGHT", "UP", "DOWN", "CENTER"))
+
+    def wait(ms):
+        world.clock_ms += int(ms)
+        world.odometer_mm += world.speed * int(ms) / 1000.0
+
+    class StopWatch:
+        def __init__(self):
+            self._t0 = world.clock_ms
+
+        def time(self):
+            return world.clock_ms - self._t0
+
+    class ColorSensor:
+        def __init__(self, port):
+            self._key = port.name.split(".")[-1]
+
+        def reflection(self):
+            counter.hit("reflection")
+            return world.reflections.get(self._key, 50)
+
+        def color(self):
+            counter.hit("color")
+            return world.colors.get(self._key)
+
+    class UltrasonicSensor:
+        def __init__(self, port):
+            pass
+
+        def distance(self):
+            counter.hit("distance")
+            return world.distance
+
+    class Motor:
+        def __init__(self, port, positive_direction=None):
+            pass
+
+        def reset_angle(self, angle):
+            counter.hit("motor.reset_angle")
+
+        def run_target(self, speed, target, then=None, wait=True):
+            counter.hit("motor.run_target")
+
+        def stop(self, then=None):
+            counter.hit("motor.stop")
+
+    class _Buttons:
+        def pressed(self):
+            pressed = world.on_buttons() if world.on_buttons is not None else []
+            counter.hit("buttons.pressed")
+            return pressed
+
+    class _Speaker:
+        def beep(self, frequency=500, duration=100):
+            counter.hit("speaker.beep")
+
+        def say(self, text):
+            counter.hit("speaker.say")
+
+    class _Screen:
+        def clear(self):
+            counter.hit("screen.clear")
+
+        def draw_text(self, x, y, text):
+            counter.hit("screen.draw_text")
+
+    class EV3Brick:
+        def __init__(self):
+            self.buttons = _Buttons()
+            self.speaker = _Speaker()
+            self.screen = _Screen()
+
+    class DriveBase:
+        def __init__(self, left_motor, right_motor, wheel_diameter, axle_track):
+            pass
+
+        def settings(self, straight_speed=None, straight_acceleration=None, turn_rate=None, turn_acceleration=None):
+            counter.hit("drive.settings")
+
+        def drive(self, speed, turn_rate):
+            counter.hit("drive.drive")
+            world.speed = speed
+
+        def straight(self, distance):
+            counter.hit("drive.straight")
+            world.speed = 0
+            world.odometer_mm += distance
+
+        def turn(self, angle):
+            counter.hit("drive.turn")
+            world.speed = 0
+
+        def stop(self):
+            counter.hit("drive.stop")
+            world.speed = 0
+
+        def distance(self):
+            counter.hit("drive.distance")
+            return world.odometer_mm
+
+    pkg = types.ModuleType("pybricks")
+    pkg.__path__ = []
+    modules = {
+        "pybricks.parameters": {"Port": Port, "Color": Color, "Stop": Stop, "Direction": Direction, "Button": Button},
+        "pybricks.tools": {"wait": wait, "StopWatch": StopWatch},
+        "pybricks.ev3devices": {"ColorSensor": ColorSensor, "UltrasonicSensor": UltrasonicSensor, "Motor": Motor},
+        "pybricks.hubs": {"EV3Brick": EV3Brick},
+        "pybricks.robotics": {"DriveBase": DriveBase},
+    }
+    sys.modules["pybricks"] = pkg
+    for name, attrs in modules.items():
+        mod = types.ModuleType(name)
+        for k, v in attrs.items():
+            setattr(mod, k, v)
+        setattr(pkg, name.split(".")[-1], mod)
+        sys.modules[name] = mod
@@ -63,8 +63,7 @@ class LineFollower:
         3-bit state from (left_black, center_black, right_black) => 0..7.
         Bits: [L, C, R] = [bit2, bit1, bit0]
         """
-        ref_l = robot.left_color.reflection()
-        ref_r = robot.right_color.reflection()
+        ref_l, ref_r = robot.reflections()
         l = 1 if _is_black_reflection(ref_l) else 0
         c = 1 if robot.center_is_black() else 0
         r = 1 if _is_black_reflection(ref_r) else 0
@@ -9,9 +9,13 @@ from pybricks.tools import StopWatch, wait
 
 import config
 import navigator
+import route_planner
+from dfs_stack import DIR_B, DIR_S, DfsStack
 from gripper import Gripper
 from line_follow import LineFollower
+from maze_map import V_GREEN, V_OBJECT, V_RED, MazeMap
 from robot import Robot
+from speed_profile import corridor_speed
 from utils import EdgeDebounce, fmt_ms
 
 
@@ -28,8 +32,12 @@ def main() -> None:
     robot.wait_for_center_press()
     robot.beep(900, 150)
 
+    if config.ENABLE_SENSOR_THREAD:
+        robot.start_sampler()
+
     sw = StopWatch()
     node_debounce = EdgeDebounce(config.NODE_DEBOUNCE_MS)
+    green_debounce = EdgeDebounce(config.NODE_DEBOUNCE_MS)
 
     # The spec names this counter "blue_stack" even though the sticker is RED.
     blue_stack = 0
@@ -37,16 +45,20 @@ def main() -> None:
     has_block = False
     drop_on_node = False
 
-    # DFS stack: each entry stores remaining options at an intersection.
-    dfs_stack = []
+    # DFS stack: one packed byte per intersection (kind, taken branch, remaining options).
+    dfs_stack = DfsStack(config.DFS_STACK_CAPACITY)
     backtracking = False
 
     # last_dir affects lost-line recovery.
-    # Possible: "L", "S", "R", "B"
-    last_dir = "S"
+    # Direction code from dfs_stack: DIR_S / DIR_R / DIR_B / DIR_L
+    last_dir = DIR_S
 
     pickup_hits = 0
 
+    # Delivery planning: record a map while exploring, then follow the planned route.
+    maze = MazeMap() if config.ENABLE_ROUTE_PLAN else None
+    route = None
+
     while True:
         pressed = robot.brick.buttons.pressed()
         if (Button.LEFT in pressed) and (Button.RIGHT in pressed):
@@ -61,23 +73,46 @@ def main() -> None:
 
             if pickup_hits >= int(config.PICKUP_CONFIRM_COUNT):
                 robot.stop()
-                robot.say("Pick up")
-                gripper.close()
-                has_block = True
-                drop_on_node = bool(config.DROP_ON_NODE_RED)
                 pickup_hits = 0
+                if maze is not None and route is None:
+                    # Mapping run: only record the object and treat it as a dead end.
+                    v = maze.line_end(V_OBJECT, robot.odometer_mm())
+                    robot.beep(1000, 100)
+                    navigator.do_turn(robot, int(config.TURN_UTURN_DEG))
+                    maze.depart(v, DIR_B, robot.odometer_mm())
+                    backtracking = True
+                else:
+                    robot.say("Pick up")
+                    gripper.close()
+                    has_block = True
+                    drop_on_node = bool(config.DROP_ON_NODE_RED)
+                    if route is not None:
+                        # Objects are dead ends on the map: head back the way we came.
+                        navigator.do_turn(robot, int(config.TURN_UTURN_DEG))
+                        route.begin_corridor(robot.odometer_mm())
                 follower.reset_flags()
 
         # Finish detection (GREEN).
         if robot.center_is_green():
-            robot.stop()
-            robot.say("Finish")
-            break
+            if maze is None or route is not None:
+                robot.stop()
+                robot.say("Finish")
+                break
+            if green_debounce.ready():
+                # Mapping run: record the finish and keep exploring.
+                green_debounce.trigger()
+                robot.stop()
+                v = maze.line_end(V_GREEN, robot.odometer_mm())
+                navigator.do_turn(robot, int(config.TURN_UTURN_DEG))
+                maze.depart(v, DIR_B, robot.odometer_mm())
+                backtracking = True
+                follower.reset_flags()
 
         # Node detection (RED).
         if robot.center_is_red() and node_debounce.ready():
             node_debounce.trigger()
             blue_stack += 1
+            node_odo = robot.odometer_mm() if maze is not None else 0
 
             robot.stop()
             robot.beep(1200, 150)
@@ -98,24 +133,55 @@ def main() -> None:
                 navigator.do_turn(robot, int(config.TURN_UTURN_DEG))
                 follower.reset_flags()
 
+            if maze is not None and route is None:
+                v = maze.line_end(V_RED, node_odo)
+                maze.depart(v, DIR_B, robot.odometer_mm())
+            elif route is not None:
+                if route.done() and not route.ends_at_finish:
+                    # Last planned drop done and no GREEN known.
+                    break
+                route.begin_corridor(robot.odometer_mm())
+
         # State calculation (3-bit, 0..7).
         state = int(follower.state_from_sensors(robot))
         is_intersection, is_lost = follower.update_flags_from_state(state)
 
         if is_lost:
             navigator.recover_from_lost(robot, follower, last_dir)
+        elif is_intersection and route is not None:
+            last_dir = navigator.handle_intersection_route(robot, follower, route)
         elif is_intersection:
-            last_dir, backtracking = navigator.handle_intersection_dfs(robot, follower, dfs_stack, backtracking)
+            last_dir, backtracking = navigator.handle_intersection_dfs(robot, follower, dfs_stack, backtracking, maze)
+
+            if maze is not None and maze.explored:
+                route = route_planner.plan_route(maze, int(config.PLAN_EXACT_MAX))
+                robot.show("Plan", f"stops={len(route.stops)}", f"{route.total_mm}mm")
+                if not route.stops:
+                    break
+                last_dir = navigator.start_route(robot, follower, route)
+                backtracking = False
         else:
             # Normal line following using left/right reflections only.
-            ref_l = robot.left_color.reflection()
-            ref_r = robot.right_color.reflection()
+            ref_l, ref_r = robot.reflections()
             turn_rate = follower.compute_turn_rate(ref_l, ref_r)
-            robot.drive.drive(int(config.BASE_SPEED), float(turn_rate))
+            speed = int(config.BASE_SPEED)
+            if route is not None and config.ENABLE_SPEED_PROFILE:
+                # Known corridor: speed up on long straights, back to BASE_SPEED before the junction.
+                traveled, remaining = route.corridor_progress(robot.odometer_mm())
+                speed = corridor_speed(
+                    traveled,
+                    remaining,
+                    int(config.BASE_SPEED),
+                    int(config.PROFILE_MAX_SPEED),
+                    int(config.DRIVE_STRAIGHT_ACCEL),
+                    int(config.PROFILE_BRAKE_MARGIN_MM),
+                )
+            robot.drive.drive(speed, float(turn_rate))
 
         wait(int(config.CONTROL_LOOP_MS))
 
     robot.stop()
+    robot.stop_sampler()
     robot.show("Stopped", f"RED={blue_stack}", f"t={fmt_ms(sw.time())}")
     robot.beep(600, 200)
 
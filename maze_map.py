@@ -0,0 +1,185 @@
+"""
+Maze map recorded during DFS exploration.
+
+Vertices are junctions and line ends (start, RED nodes, objects, GREEN). Each vertex
+has 4 slots indexed by direction code (dfs_stack.DIR_*) in the vertex's own frame:
+the heading the robot had when it first reached it, so slot DIR_B always leads back
+toward where it came from. A slot stores the neighbor vertex, the neighbor's slot on
+the other end, and the corridor length in mm (odometer from leaving one vertex to
+detecting the next). Junctions also keep their classification (dfs_stack.KIND_*), so a
+known junction can be checked when it is reached again.
+
+No pybricks dependency: odometer values are passed in by the caller.
+
+All comments are intentionally in English (per user rule).
+"""
+
+from array import array
+
+from dfs_stack import DIR_B, DIR_S, KIND_T, heading_after, relative_turn
+
+# Vertex kinds.
+V_START = 0
+V_JUNCTION = 1
+V_RED = 2
+V_OBJECT = 3
+V_GREEN = 4
+
+_INF = 10**9
+
+
+class MazeMap:
+    def __init__(self):
+        self.kinds = bytearray()
+        self._jkind = bytearray()
+        self._nbr = array("h")
+        self._nbr_slot = bytearray()
+        self._len = array("H")
+
+        # Junctions on the current DFS path (parallel to the DfsStack).
+        self._path = []
+
+        # Where the robot last left from: (vertex, slot, odometer mm).
+        self._dep_v = self._add(V_START)
+        self._dep_slot = DIR_S
+        self._dep_odo = 0
+
+        # Set when exploration is complete: robot stopped at `at_vertex`, facing `heading`.
+        self.explored = False
+        self.at_vertex = -1
+        self.heading = DIR_S
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def _add(self, kind: int) -> int:
+        v = len(self.kinds)
+        self.kinds.append(kind)
+        self._jkind.append(KIND_T)
+        for _ in range(4):
+            self._nbr.append(-1)
+            self._nbr_slot.append(0)
+            self._len.append(0)
+        return v
+
+    def _connect(self, v: int, slot: int, odo_mm: int) -> None:
+        # Connect the last departure slot to (v, slot) with the driven length.
+        length = max(0, min(65535, int(odo_mm) - self._dep_odo))
+        a = self._dep_v * 4 + self._dep_slot
+        b = v * 4 + slot
+        self._nbr[a] = v
+        self._nbr_slot[a] = slot
+        self._len[a] = length
+        self._nbr[b] = self._dep_v
+        self._nbr_slot[b] = self._dep_slot
+        self._len[b] = length
+
+    def neighbor(self, v: int, slot: int) -> int:
+        return self._nbr[v * 4 + slot]
+
+    def length(self, v: int, slot: int) -> int:
+        return self._len[v * 4 + slot]
+
+    def junction_kind(self, v: int) -> int:
+        return self._jkind[v]
+
+    def vertices(self, kind: int):
+        return [v for v in range(len(self.kinds)) if self.kinds[v] == kind]
+
+    # ------------------------------
+    # Recording (called from navigator / main)
+    # ------------------------------
+
+    def depart(self, v: int, slot: int, odo_mm: int) -> None:
+        self._dep_v = v
+        self._dep_slot = slot
+        self._dep_odo = int(odo_mm)
+
+    def new_junction(self, odo_mm: int, kind: int) -> int:
+        # First arrival at a junction: the corridor behind us is its DIR_B slot.
+        v = self._add(V_JUNCTION)
+        self._jkind[v] = kind
+        self._connect(v, DIR_B, odo_mm)
+        self._path.append(v)
+        return v
+
+    def top_junction(self) -> int:
+        return self._path[-1]
+
+    def pop_junction(self) -> int:
+        return self._path.pop()
+
+    def line_end(self, kind: int, odo_mm: int) -> int:
+        # A dead end (RED / object / GREEN); the robot U-turns and leaves via DIR_B.
+        v = self._add(kind)
+        self._connect(v, DIR_B, odo_mm)
+        return v
+
+    def finish(self, v: int, heading: int) -> None:
+        self.explored = True
+        self.at_vertex = v
+        self.heading = heading
+
+    # ------------------------------
+    # Queries
+    # ------------------------------
+
+    def shortest_paths(self, src: int):
+        """
+        Dijkstra from src (linear scan; maps are small).
+        Returns (dist, prev) where prev[v] = slot index (u * 4 + slot) used to reach v.
+        """
+        n = len(self.kinds)
+        dist = [_INF] * n
+        prev = [-1] * n
+        done = bytearray(n)
+        dist[src] = 0
+        for _ in range(n):
+            u = -1
+            best = _INF
+            for v in range(n):
+                if not done[v] and dist[v] < best:
+                    best = dist[v]
+                    u = v
+            if u < 0:
+                break
+            done[u] = 1
+            for s in range(4):
+                w = self._nbr[u * 4 + s]
+                if w < 0:
+                    continue
+                d = best + self._len[u * 4 + s]
+                if d < dist[w]:
+                    dist[w] = d
+                    prev[w] = u * 4 + s
+        return dist, prev
+
+    def path_steps(self, prev, src: int, dst: int):
+        """
+        Reconstruct src -> dst from shortest_paths(src).
+        Returns a list of (vertex, in_slot, out_slot, length); in_slot is -1 for src.
+        """
+        hops = []
+        v = dst
+        while v != src:
+            p = prev[v]
+            if p < 0:
+                return None
+            hops.append(p)
+            v = p // 4
+        hops.reverse()
+
+        steps = []
+        in_slot = -1
+        for p in hops:
+            u = p // 4
+            s = p % 4
+            steps.append((u, in_slot, s, self._len[p]))
+            in_slot = self._nbr_slot[p]
+        steps.append((dst, in_slot, -1, 0))
+        return steps
+
+
+def turn_at(in_slot: int, out_slot: int) -> int:
+    # Turn at a vertex entered through in_slot to leave through out_slot.
+    return relative_turn(heading_after(in_slot, DIR_B), out_slot)
@@ -7,6 +7,20 @@ All comments are intentionally in English (per user rule).
 from pybricks.tools import wait
 
 import config
+from dfs_stack import (
+    BIT_L,
+    BIT_R,
+    BIT_S,
+    DIR_B,
+    DIR_L,
+    DIR_R,
+    DIR_S,
+    KIND_PLUS,
+    KIND_T,
+    backtrack_step,
+    expected_state,
+    take_first,
+)
 
 
 def do_turn(robot, angle_deg: int) -> None:
@@ -25,8 +39,7 @@ def _follow_for_ms(robot, follower, ms: int, speed: int) -> float:
     acc = 0.0
     n = 0
     while elapsed < int(ms):
-        ref_l = robot.left_color.reflection()
-        ref_r = robot.right_color.reflection()
+        ref_l, ref_r = robot.reflections()
         tr = float(follower.compute_turn_rate(ref_l, ref_r))
         robot.drive.drive(int(speed), tr)
         acc += tr
@@ -68,8 +81,8 @@ def classify_intersection(robot, follower):
     - advance slightly, then check:
       - state==5(101) => T
       - state==7(111) => +
-    Returns (kind, dir_array)
-    dir_array = [L, S, R] with 0/1.
+    Returns (kind, mask)
+    mask = available branches as a bitmask of direction codes (see dfs_stack).
     """
     robot.drive.straight(int(config.INTERSECTION_ADVANCE_MM))
     robot.drive.stop()
@@ -78,82 +91,212 @@ def classify_intersection(robot, follower):
 
     state = int(follower.state_from_sensors(robot))
     if state == 7:
-        return "PLUS", [1, 1, 1]
+        return KIND_PLUS, BIT_L | BIT_S | BIT_R
     if state == 5:
-        return "T", [1, 0, 1]
+        return KIND_T, BIT_L | BIT_R
     # Fallback: treat unknown as T-like.
-    return "T", [1, 0, 1]
+    return KIND_T, BIT_L | BIT_R
 
 
-def handle_intersection_dfs(robot, follower, dfs_stack, backtracking: bool):
+def _stop_at_known_junction(robot, follower, expected: int) -> bool:
     """
-    DFS(backtracking) intersection handling.
+    Creep to the center of a known junction and stop there (a turn follows).
 
-    - When exploring: push remaining options to stack.
-    - When backtracking: pop until an intersection with remaining options is found.
-      If none, keep going straight (continue backtracking).
-    Returns (last_dir, backtracking).
+    The state is compared with what the map predicts; on a mismatch, settle and read
+    once more like classify_intersection does. Returns False if it still does not match.
+    expected < 0 means nothing to check.
     """
-    kind, dir_array = classify_intersection(robot, follower)
-
-    # Build options in priority order: Right -> Straight -> Left
-    options = []
-    if int(dir_array[2]) == 1:
-        options.append("R")
-    if int(dir_array[1]) == 1:
-        options.append("S")
-    if int(dir_array[0]) == 1:
-        options.append("L")
-
-    chosen = "S"
-    if backtracking:
-        # Skip finished intersections.
-        while dfs_stack and (not dfs_stack[-1]["options"]):
-            dfs_stack.pop()
-
-        if dfs_stack and dfs_stack[-1]["options"]:
-            chosen = dfs_stack[-1]["options"].pop(0)
-            backtracking = False
-        else:
-            # Continue backtracking: go straight through this intersection.
-            chosen = "S"
-            backtracking = True
-    else:
-        if not options:
-            chosen = "B"
-            backtracking = True
-        else:
-            chosen = options.pop(0)
-            dfs_stack.append({"options": options})
+    robot.drive.straight(int(config.INTERSECTION_ADVANCE_MM))
+    robot.drive.stop()
+    if expected < 0 or int(follower.state_from_sensors(robot)) == expected:
+        return True
+    wait(30)
+    return int(follower.state_from_sensors(robot)) == expected
+
+
+def _pass_known_junction(robot, follower, expected: int) -> bool:
+    """
+    Drive straight through a known junction at BASE_SPEED without stopping.
+
+    The state is sampled while moving until the odometer has gone INTERSECTION_ADVANCE_MM
+    (junction center), then the robot keeps going for EXIT_INTERSECTION_MM.
+    Returns True if the state read at the center matched expected (expected < 0: no check).
+    """
+    speed = int(config.BASE_SPEED)
+    center = robot.odometer_mm() + int(config.INTERSECTION_ADVANCE_MM)
+    state = -1
+    while robot.odometer_mm() < center:
+        state = int(follower.state_from_sensors(robot))
+        robot.drive.drive(speed, 0)
+        wait(int(config.CONTROL_LOOP_MS))
+    end = center + int(config.EXIT_INTERSECTION_MM)
+    while robot.odometer_mm() < end:
+        robot.drive.drive(speed, 0)
+        wait(int(config.CONTROL_LOOP_MS))
+    follower.reset_flags()
+    return expected < 0 or state == expected
 
-    last_dir = chosen
 
-    # Execute decision.
-    if chosen == "R":
+def _execute_turn(robot, follower, kind: int, turn: int) -> int:
+    # Execute a turn at the junction center and return the direction actually taken.
+    if turn == DIR_R:
         # For T-like intersections, a short right attempt can distinguish ㅏ/ㅓ behavior.
-        if kind == "T":
+        if kind == KIND_T:
             committed = _short_right_try(robot, follower)
             if not committed:
                 # Treat as straight if it did not commit.
-                last_dir = "S"
+                return DIR_S
         else:
             do_turn(robot, int(config.TURN_RIGHT_DEG))
-    elif chosen == "L":
+    elif turn == DIR_L:
         do_turn(robot, int(config.TURN_LEFT_DEG))
-    elif chosen == "B":
+    elif turn == DIR_B:
         do_turn(robot, int(config.TURN_UTURN_DEG))
     else:
         # Straight: do nothing.
         pass
+    return turn
+
 
+def _exit_junction(robot, follower) -> None:
     robot.drive.straight(int(config.EXIT_INTERSECTION_MM))
     robot.drive.stop()
     follower.reset_flags()
 
+
+def _backtrack_known(robot, follower, dfs_stack, maze):
+    """
+    Backtracking arrival at the junction on top of the stack.
+
+    The robot is returning along the branch it last took there, so its heading in the
+    junction's entry frame is the opposite of the stored "taken" branch. The stored
+    classification is reused and only checked against the line state at the center.
+    Going straight on, the junction is passed at speed; the robot only stops for a turn.
+    Every branch chosen here comes from the stack, so turns are plain (no short right try).
+    If maze is given and this was the last open junction, exploration is complete:
+    the robot stops at the junction center and maze.finish() records where it is.
+    Returns (last_dir, backtracking).
+    """
+    kind = dfs_stack.kind()
+    v = maze.top_junction() if maze is not None else -1
+
+    arrival, target, turn, backtracking = backtrack_step(dfs_stack)
+    finished = backtracking and maze is not None and len(dfs_stack) == 0
+    expected = expected_state(kind, arrival)
+
+    if turn == DIR_S and not finished:
+        ok = _pass_known_junction(robot, follower, expected)
+    else:
+        ok = _stop_at_known_junction(robot, follower, expected)
+    if not ok:
+        # The stored map does not match what we see; warn and keep following the stack.
+        robot.beep(400, 80)
+
+    if backtracking and maze is not None:
+        # Junction finished: heading back toward where we first entered it.
+        maze.pop_junction()
+        if finished:
+            follower.reset_flags()
+            maze.finish(v, arrival)
+            return DIR_S, False
+
+    if turn != DIR_S:
+        # The branch is known to exist: plain turn, no short right try.
+        _execute_turn(robot, follower, KIND_PLUS, turn)
+        _exit_junction(robot, follower)
+    if maze is not None:
+        maze.depart(v, target, robot.odometer_mm())
+    return turn, backtracking
+
+
+def handle_intersection_dfs(robot, follower, dfs_stack, backtracking: bool, maze=None):
+    """
+    DFS(backtracking) intersection handling.
+
+    - When exploring: classify, take the first option and push the junction to the stack.
+      Each entry stores its kind, the remaining options and the branch taken.
+    - When backtracking: the junction reached is the top of the stack. It is not
+      re-classified; the stored entry gives the turn to the next remaining option,
+      or back toward its parent (entry popped, keep backtracking).
+    Options and the taken branch are direction codes relative to the heading the
+    junction was first entered with; dfs_stack is a dfs_stack.DfsStack.
+    If maze (maze_map.MazeMap) is given, junctions and corridor lengths are recorded.
+    Returns (last_dir, backtracking).
+    """
+    if backtracking and len(dfs_stack) > 0:
+        return _backtrack_known(robot, follower, dfs_stack, maze)
+
+    odo = robot.odometer_mm() if maze is not None else 0
+
+    kind, mask = classify_intersection(robot, follower)
+    v = maze.new_junction(odo, kind) if maze is not None else -1
+
+    # Priority order: Right -> Straight -> Left
+    chosen, remaining = take_first(mask)
+    if chosen < 0:
+        chosen = DIR_B
+        backtracking = True
+    else:
+        backtracking = False
+
+    last_dir = _execute_turn(robot, follower, kind, chosen)
+    if chosen != DIR_B:
+        dfs_stack.push(kind, remaining, last_dir)
+    elif maze is not None:
+        maze.pop_junction()
+
+    _exit_junction(robot, follower)
+    if maze is not None:
+        maze.depart(v, last_dir, robot.odometer_mm())
+
     return last_dir, backtracking
 
 
-def recover_from_lost(robot, follower, last_dir: str) -> None:
+def start_route(robot, follower, route) -> int:
+    """
+    Take the first turn of a planned route at the junction where exploration ended
+    (the robot is stopped at its center). Returns last_dir.
+    """
+    turn = route.next_turn()
+    if turn < 0:
+        return DIR_S
+    # The branch is known to exist: plain turn, no short right try.
+    last_dir = _execute_turn(robot, follower, KIND_PLUS, turn)
+    _exit_junction(robot, follower)
+    route.begin_corridor(robot.odometer_mm())
+    return last_dir
+
+
+def handle_intersection_route(robot, follower, route) -> int:
+    """
+    Junction handling while following a planned route (route_planner.Route).
+
+    The junction is known from the map, so it is not classified: the line state at its
+    center is only compared with the one the route expects. Straight turns are driven
+    through at speed, the robot only stops for an actual turn. A failed check is treated
+    as a false trigger and does not consume a turn. Returns last_dir.
+    """
+    turn = route.peek_turn()
+    expected = route.expected_state()
+    if turn < 0 or turn == DIR_S:
+        if not _pass_known_junction(robot, follower, expected):
+            return DIR_S
+        route.next_turn()
+        route.begin_corridor(robot.odometer_mm())
+        return DIR_S
+
+    if not _stop_at_known_junction(robot, follower, expected):
+        follower.reset_flags()
+        return DIR_S
+    route.next_turn()
+    # The branch is known to exist: plain turn, no short right try.
+    last_dir = _execute_turn(robot, follower, KIND_PLUS, turn)
+    _exit_junction(robot, follower)
+    route.begin_corridor(robot.odometer_mm())
+    return last_dir
+
+
+def recover_from_lost(robot, follower, last_dir: int) -> None:
     """
     Lost-line recovery based on the last direction (last_dir).
 
@@ -168,11 +311,11 @@ def recover_from_lost(robot, follower, last_dir: str) -> None:
     attempts = 0
     while not robot.center_is_black():
         attempts += 1
-        if last_dir == "L":
+        if last_dir == DIR_L:
             robot.drive.drive(0, -160)
             wait(140)
             robot.drive.stop()
-        elif last_dir == "R":
+        elif last_dir == DIR_R:
             robot.drive.drive(0, 160)
             wait(140)
             robot.drive.stop()
@@ -37,7 +37,49 @@ class Robot:
         )
 
         # Sensible defaults
-        self.drive.settings(straight_speed=200, straight_acceleration=400, turn_rate=250, turn_acceleration=400)
+        self.drive.settings(
+            straight_speed=config.DRIVE_STRAIGHT_SPEED,
+            straight_acceleration=config.DRIVE_STRAIGHT_ACCEL,
+            turn_rate=config.DRIVE_TURN_RATE,
+            turn_acceleration=config.DRIVE_TURN_ACCEL,
+        )
+
+        # Optional background sampler (sensor_thread.SensorSampler); None = read sensors inline.
+        self.sampler = None
+        # "No fresh sample" marker; sensor_thread.STALE once the sampler is started.
+        self._stale = object()
+
+    # ------------------------------
+    # Background sampler (optional)
+    # ------------------------------
+
+    def start_sampler(self):
+        # Imported here so _thread is only needed when ENABLE_SENSOR_THREAD is set.
+        from sensor_thread import STALE, SensorSampler
+
+        self._stale = STALE
+        self.sampler = SensorSampler(
+            self.left_color,
+            self.center_color,
+            self.right_color,
+            self.ultra,
+            config.SENSOR_COLOR_PERIOD_MS,
+            config.SENSOR_ULTRA_PERIOD_MS,
+        )
+        self.sampler.start()
+
+    def stop_sampler(self):
+        if self.sampler is not None:
+            self.sampler.stop()
+            self.sampler = None
+
+    def _live_sampler(self):
+        # The running sampler, or None; a dead worker is dropped for good (inline reads).
+        s = self.sampler
+        if s is not None and not s.alive():
+            self.sampler = None
+            return None
+        return s
 
     # ------------------------------
     # Read sensors
@@ -45,6 +87,12 @@ class Robot:
 
     def reflections(self):
         # Returns reflections (0..100) from left/right sensors.
+        # Sampler data older than SENSOR_STALE_MS is ignored and the sensors are read inline.
+        s = self._live_sampler()
+        if s is not None:
+            r = s.reflections(int(config.SENSOR_STALE_MS))
+            if r is not self._stale:
+                return r
         return (
             self.left_color.reflection(),
             self.right_color.reflection(),
@@ -63,7 +111,10 @@ class Robot:
         Center sensor is used in Color mode.
         To reduce false positives, only BLACK/RED/GREEN are trusted; everything else becomes WHITE.
         """
-        c = self.center_color.color()
+        s = self._live_sampler()
+        c = s.center_color(int(config.SENSOR_STALE_MS)) if s is not None else self._stale
+        if c is self._stale:
+            c = self.center_color.color()
         if c in config.CENTER_TRUSTED_COLORS:
             return c
         return Color.WHITE
@@ -79,11 +130,20 @@ class Robot:
 
     def distance_mm(self) -> int:
         # UltrasonicSensor.distance() returns mm in Pybricks.
-        d = self.ultra.distance()
+        s = self._live_sampler()
+        d = self._stale
+        if s is not None:
+            d = s.distance(int(config.SENSOR_ULTRA_PERIOD_MS) + int(config.SENSOR_STALE_MS))
+        if d is self._stale:
+            d = self.ultra.distance()
         if d is None:
             return 10**9
         return int(d)
 
+    def odometer_mm(self) -> int:
+        # Distance driven by the DriveBase since start (turns in place barely change it).
+        return int(self.drive.distance())
+
     # ------------------------------
     # UI helpers
     # ------------------------------
@@ -0,0 +1,237 @@
+"""
+Multi-object delivery planning on an explored MazeMap.
+
+The gripper carries one object at a time, so a plan is a sequence
+object -> RED node -> object -> RED node ... (-> GREEN if known). The planner picks
+the pickup order and the RED node for each object to minimize total driven distance:
+exact (DP over subsets) up to PLAN_EXACT_MAX objects, nearest-neighbour + swap
+improvement beyond that. RED nodes accept any number of objects.
+
+No pybricks dependency.
+
+All comments are intentionally in English (per user rule).
+"""
+
+from array import array
+
+from dfs_stack import DIR_B, expected_state, heading_after, relative_turn
+from maze_map import V_GREEN, V_OBJECT, V_RED, turn_at
+
+_INF = 10**9
+
+
+class Route:
+    """
+    Turns to take at each junction along a plan, in order, plus the stops
+    (object / RED / GREEN vertices) they lead to, and the recorded length of every
+    corridor driven, in order (one per junction left or stop turned around at).
+    checks[i] is the line state expected at the junction of turns[i]
+    (dfs_stack.expected_state), or 0xFF where nothing is checked (the first junction).
+    """
+
+    def __init__(self):
+        self.turns = bytearray()
+        self.checks = bytearray()
+        self.lengths = array("H")
+        self.stops = []
+        self.total_mm = 0
+        self.ends_at_finish = False
+        self._i = 0
+        self._j = 0
+        self._seg_start = 0
+        self._seg_len = 0
+
+    def next_turn(self) -> int:
+        # Next junction turn (direction code), or -1 when the route is exhausted.
+        if self._i >= len(self.turns):
+            return -1
+        t = self.turns[self._i]
+        self._i += 1
+        return t
+
+    def peek_turn(self) -> int:
+        # Next junction turn without consuming it, or -1 when the route is exhausted.
+        if self._i >= len(self.turns):
+            return -1
+        return self.turns[self._i]
+
+    def expected_state(self) -> int:
+        # Line state expected at the next junction, or -1 if unknown.
+        if self._i >= len(self.checks) or self.checks[self._i] == 0xFF:
+            return -1
+        return self.checks[self._i]
+
+    def done(self) -> bool:
+        return self._i >= len(self.turns)
+
+    def begin_corridor(self, odo_mm: int) -> None:
+        # Called when leaving a junction or a stop: start tracking the next corridor.
+        self._seg_start = int(odo_mm)
+        if self._j < len(self.lengths):
+            self._seg_len = self.lengths[self._j]
+            self._j += 1
+        else:
+            self._seg_len = 0
+
+    def corridor_progress(self, odo_mm: int):
+        # (traveled, remaining) in mm on the current corridor; remaining <= 0 if unknown.
+        traveled = int(odo_mm) - self._seg_start
+        return traveled, self._seg_len - traveled
+
+
+def _best_drop(dist, a: int, drops, b: int):
+    # Cheapest a -> drop -> b (b < 0: stop at the drop). Returns (cost, drop).
+    best = _INF
+    best_d = -1
+    for d in drops:
+        c = dist[a][d] + (dist[d][b] if b >= 0 else 0)
+        if c < best:
+            best = c
+            best_d = d
+    return best, best_d
+
+
+def _order_exact(n: int, first, leg, last):
+    # DP over subsets: cost[mask][j] = cheapest way to have delivered mask, ending with pickup j.
+    full = (1 << n) - 1
+    cost = [[_INF] * n for _ in range(1 << n)]
+    back = [[-1] * n for _ in range(1 << n)]
+    for j in range(n):
+        cost[1 << j][j] = first[j]
+    for mask in range(1, full + 1):
+        row = cost[mask]
+        for i in range(n):
+            ci = row[i]
+            if ci >= _INF:
+                continue
+            for j in range(n):
+                if mask & (1 << j):
+                    continue
+                c = ci + leg[i][j]
+                m2 = mask | (1 << j)
+                if c < cost[m2][j]:
+                    cost[m2][j] = c
+                    back[m2][j] = i
+
+    best = _INF
+    end = -1
+    for i in range(n):
+        c = cost[full][i] + last[i]
+        if c < best:
+            best = c
+            end = i
+
+    order = []
+    mask = full
+    i = end
+    while i >= 0:
+        order.append(i)
+        prev = back[mask][i]
+        mask &= ~(1 << i)
+        i = prev
+    order.reverse()
+    return order
+
+
+def _order_cost(order, first, leg, last) -> int:
+    c = first[order[0]] + last[order[-1]]
+    for k in range(len(order) - 1):
+        c += leg[order[k]][order[k + 1]]
+    return c
+
+
+def _order_heuristic(n: int, first, leg, last):
+    # Nearest neighbour, then pairwise swaps while they shorten the tour.
+    left = list(range(n))
+    cur = min(left, key=lambda j: first[j])
+    order = [cur]
+    left.remove(cur)
+    while left:
+        cur = min(left, key=lambda j: leg[order[-1]][j])
+        order.append(cur)
+        left.remove(cur)
+
+    best = _order_cost(order, first, leg, last)
+    improved = True
+    while improved:
+        improved = False
+        for a in range(n - 1):
+            for b in range(a + 1, n):
+                order[a], order[b] = order[b], order[a]
+                c = _order_cost(order, first, leg, last)
+                if c < best:
+                    best = c
+                    improved = True
+                else:
+                    order[a], order[b] = order[b], order[a]
+    return order
+
+
+def plan_deliveries(dist, start: int, objects, drops, finish: int = -1, exact_max: int = 7):
+    """
+    dist[a][b]: shortest driven distance between vertices (dict of lists).
+    Returns (stops, total_mm): stops = [o1, d1, o2, d2, ..., finish?].
+    Objects unreachable or without any reachable RED node are skipped.
+    """
+    objects = [o for o in objects if dist[start][o] < _INF and _best_drop(dist, o, drops, -1)[0] < _INF]
+    n = len(objects)
+    if n == 0:
+        if finish >= 0 and dist[start][finish] < _INF:
+            return [finish], dist[start][finish]
+        return [], 0
+
+    first = [dist[start][o] for o in objects]
+    leg = [[_best_drop(dist, a, drops, b)[0] for b in objects] for a in objects]
+    last = [_best_drop(dist, a, drops, finish)[0] for a in objects]
+
+    if n <= int(exact_max):
+        order = _order_exact(n, first, leg, last)
+    else:
+        order = _order_heuristic(n, first, leg, last)
+
+    stops = []
+    for k, i in enumerate(order):
+        o = objects[i]
+        nxt = objects[order[k + 1]] if k + 1 < n else finish
+        stops.append(o)
+        stops.append(_best_drop(dist, o, drops, nxt)[1])
+    if finish >= 0:
+        stops.append(finish)
+    return stops, _order_cost(order, first, leg, last)
+
+
+def plan_route(maze, exact_max: int = 7) -> Route:
+    """
+    Plan deliveries from where exploration ended (maze.at_vertex / maze.heading)
+    and turn them into junction turns for navigator.handle_intersection_route.
+    The first turn is taken at the current junction (navigator.start_route).
+    """
+    objects = maze.vertices(V_OBJECT)
+    drops = maze.vertices(V_RED)
+    greens = maze.vertices(V_GREEN)
+    finish = greens[0] if greens else -1
+    start = maze.at_vertex
+
+    trees = {}
+    for v in [start] + objects + drops:
+        trees[v] = maze.shortest_paths(v)
+    dist = {v: t[0] for v, t in trees.items()}
+
+    route = Route()
+    route.stops, route.total_mm = plan_deliveries(dist, start, objects, drops, finish, exact_max)
+    route.ends_at_finish = finish >= 0
+
+    src = start
+    for dst in route.stops:
+        steps = maze.path_steps(trees[src][1], src, dst)
+        for v, in_slot, out_slot, length in steps[:-1]:
+            route.lengths.append(length)
+            if v == start and in_slot < 0:
+                route.turns.append(relative_turn(maze.heading, out_slot))
+                route.checks.append(0xFF)
+            elif in_slot >= 0:
+                route.turns.append(turn_at(in_slot, out_slot))
+                route.checks.append(expected_state(maze.junction_kind(v), heading_after(in_slot, DIR_B)))
+            # in_slot < 0 at a previous stop: dead end, the U-turn is done on arrival.
+        src = dst
+    return route
@@ -0,0 +1,297 @@
+"""
+Host-side check of the delivery planning path (explore -> plan -> follow the turns).
+
+For every random tree maze:
+- explores it with MazeMap + DfsStack using the same decisions as navigator
+  (take_first when exploring, backtrack_step when backtracking),
+- plans with route_planner.plan_route,
+- follows route.turns through the real maze and checks that the stops are reached
+  in planned order, that every corridor length matches route.lengths and that the
+  state expected at every junction (route.checks) matches the real junction.
+Also compares plan_deliveries with a brute force on small random instances.
+
+Exits with status 1 on the first failure.
+
+Run with CPython on a PC (no pybricks needed):
+    python route_sim.py --mazes 300
+
+All comments are intentionally in English (per user rule).
+"""
+
+import argparse
+import itertools
+import random
+import sys
+
+from dfs_stack import (
+    BIT_L,
+    BIT_R,
+    BIT_S,
+    DIR_B,
+    DIR_L,
+    DIR_R,
+    DIR_S,
+    KIND_PLUS,
+    KIND_T,
+    DfsStack,
+    backtrack_step,
+    expected_state,
+    heading_after,
+    take_first,
+)
+from maze_map import V_GREEN, V_JUNCTION, V_OBJECT, V_RED, V_START, MazeMap
+from route_planner import plan_deliveries, plan_route
+
+_INF = 10**9
+
+
+class _SimMaze:
+    """
+    Random tree maze. Node 0 is the start line end, node 1 the first junction.
+    Junction frames follow MazeMap: the heading a junction is first entered with,
+    so slot DIR_B always leads to the parent. children[node * 4 + d] is the node
+    reached through branch d, lengths[node * 4 + d] the corridor length in mm.
+    """
+
+    def __init__(self, rng, junctions: int, object_prob: float):
+        self.kinds = [V_START]
+        self.jkinds = [KIND_T]
+        self.children = [-1, -1, -1, -1]
+        self.lengths = [0, 0, 0, 0]
+        self.parent = [-1]
+
+        root = self._add(rng, 0, DIR_S, V_JUNCTION)
+        open_slots = [(root, d) for d in self._branches(root)]
+        made = 1
+        while open_slots:
+            node, d = open_slots.pop(rng.randrange(len(open_slots)))
+            if made < junctions:
+                child = self._add(rng, node, d, V_JUNCTION)
+                open_slots.extend((child, b) for b in self._branches(child))
+                made += 1
+            else:
+                self._add(rng, node, d, V_OBJECT if rng.random() < object_prob else V_RED)
+
+        ends = [n for n in range(len(self.kinds)) if self.kinds[n] == V_RED]
+        if len(ends) > 1 and rng.random() < 0.7:
+            self.kinds[rng.choice(ends)] = V_GREEN
+
+    def _add(self, rng, parent: int, slot: int, kind: int) -> int:
+        node = len(self.kinds)
+        self.kinds.append(kind)
+        self.jkinds.append(KIND_PLUS if rng.random() < 0.5 else KIND_T)
+        self.children.extend((-1, -1, -1, -1))
+        self.lengths.extend((0, 0, 0, 0))
+        self.parent.append(parent)
+        length = rng.randrange(150, 1200)
+        self.children[parent * 4 + slot] = node
+        self.lengths[parent * 4 + slot] = length
+        self.children[node * 4 + DIR_B] = parent
+        self.lengths[node * 4 + DIR_B] = length
+        return node
+
+    def _branches(self, node: int):
+        return (DIR_R, DIR_S, DIR_L) if self.jkinds[node] == KIND_PLUS else (DIR_R, DIR_L)
+
+    def is_junction(self, node: int) -> bool:
+        return self.kinds[node] == V_JUNCTION
+
+    def slot_to(self, node: int, other: int) -> int:
+        for d in range(4):
+            if self.children[node * 4 + d] == other:
+                return d
+        return -1
+
+    def move(self, node: int, heading: int):
+        """
+        Leave node along heading (its frame). Returns (next_node, arrival, length):
+        arrival is the heading in next_node's frame when it is reached.
+        """
+        nxt = self.children[node * 4 + heading]
+        length = self.lengths[node * 4 + heading]
+        back = self.slot_to(nxt, node)
+        return nxt, heading_after(back, DIR_B), length
+
+
+def _explore(sim: _SimMaze, maze: MazeMap, stack: DfsStack):
+    """
+    Run the mapping pass like main.py / navigator.handle_intersection_dfs.
+    Returns {maze vertex: sim node} for every vertex recorded.
+    """
+    odo = 0
+    ends = {0: 0}
+    node, arrival, length = sim.move(0, DIR_S)
+    odo += length
+    backtracking = False
+    path = []
+    while True:
+        if not sim.is_junction(node):
+            # Line end (RED / object / GREEN): record it, U-turn, go back.
+            v = maze.line_end(sim.kinds[node], odo)
+            ends[v] = node
+            maze.depart(v, DIR_B, odo)
+            node, arrival, length = sim.move(node, DIR_B)
+            odo += length
+            backtracking = True
+            continue
+
+        if backtracking and len(stack) > 0:
+            if path[-1] != node:
+                raise AssertionError("backtracking reached junction %d, stack top is %d" % (node, path[-1]))
+            v = maze.top_junction()
+            arrival_s, target, _, backtracking = backtrack_step(stack)
+            if arrival_s != arrival:
+                raise AssertionError("stack arrival %d != real arrival %d" % (arrival_s, arrival))
+            if backtracking:
+                maze.pop_junction()
+                path.pop()
+                if len(stack) == 0:
+                    maze.finish(v, arrival)
+                    return ends
+            maze.depart(v, target, odo)
+            node, arrival, length = sim.move(node, target)
+            odo += length
+            continue
+
+        kind = sim.jkinds[node]
+        mask = (BIT_L | BIT_S | BIT_R) if kind == KIND_PLUS else (BIT_L | BIT_R)
+        v = maze.new_junction(odo, kind)
+        ends[v] = node
+        chosen, remaining = take_first(mask)
+        stack.push(kind, remaining, chosen)
+        path.append(node)
+        maze.depart(v, chosen, odo)
+        node, arrival, length = sim.move(node, chosen)
+        odo += length
+        backtracking = False
+
+
+def _follow(sim: _SimMaze, route, node: int, heading: int):
+    """
+    Follow the route like main.py in route mode: start_route at the current junction,
+    handle_intersection_route at every junction, U-turn at every stop.
+    Returns (sim nodes stopped at, corridor lengths driven).
+    """
+    stops = []
+    lengths = []
+    turn = route.next_turn()
+    if turn < 0:
+        return stops, lengths
+    heading = heading_after(heading, turn)
+    while True:
+        node, arrival, length = sim.move(node, heading)
+        lengths.append(length)
+        if not sim.is_junction(node):
+            stops.append(node)
+            if sim.kinds[node] == V_GREEN or (route.done() and not route.ends_at_finish):
+                return stops, lengths
+            # U-turn at the stop.
+            node, arrival, length = sim.move(node, DIR_B)
+            lengths.append(length)
+            if not sim.is_junction(node):
+                raise AssertionError("corridor without a junction")
+
+        expected = route.expected_state()
+        real = expected_state(sim.jkinds[node], arrival)
+        if expected != real:
+            raise AssertionError("junction %d: route expects state %d, real state %d" % (node, expected, real))
+        turn = route.next_turn()
+        if turn < 0:
+            raise AssertionError("route exhausted at junction %d" % node)
+        heading = heading_after(arrival, turn)
+        if sim.children[node * 4 + heading] < 0:
+            raise AssertionError("junction %d has no branch %d" % (node, heading))
+
+
+def _check_maze(rng, junctions: int, object_prob: float, exact_max: int) -> None:
+    sim = _SimMaze(rng, junctions, object_prob)
+    maze = MazeMap()
+    stack = DfsStack(len(sim.kinds))
+    ends = _explore(sim, maze, stack)
+    if not maze.explored:
+        raise AssertionError("exploration did not finish")
+
+    route = plan_route(maze, exact_max)
+    stops, lengths = _follow(sim, route, ends[maze.at_vertex], maze.heading)
+
+    planned = [ends[v] for v in route.stops]
+    if stops != planned:
+        raise AssertionError("stops %s, planned %s" % (stops, planned))
+    if lengths != list(route.lengths):
+        raise AssertionError("corridor lengths %s, route %s" % (lengths, list(route.lengths)))
+    if sum(lengths) != route.total_mm:
+        raise AssertionError("driven %d mm, planned %d mm" % (sum(lengths), route.total_mm))
+
+    objects = [n for n in range(len(sim.kinds)) if sim.kinds[n] == V_OBJECT]
+    picked = [n for n in stops if sim.kinds[n] == V_OBJECT]
+    if V_RED in sim.kinds and sorted(picked) != sorted(objects):
+        raise AssertionError("objects %s, picked %s" % (objects, picked))
+
+
+def _brute_force(dist, start: int, objects, drops, finish: int) -> int:
+    best = _INF
+    for order in itertools.permutations(objects):
+        for assign in itertools.product(drops, repeat=len(order)):
+            c = 0
+            at = start
+            for o, d in zip(order, assign):
+                c += dist[at][o] + dist[o][d]
+                at = d
+            if finish >= 0:
+                c += dist[at][finish]
+            best = min(best, c)
+    return best
+
+
+def _stops_cost(dist, start: int, stops) -> int:
+    c = 0
+    at = start
+    for s in stops:
+        c += dist[at][s]
+        at = s
+    return c
+
+
+def _check_deliveries(rng, exact_max: int) -> None:
+    # Random points on a grid with Manhattan distances (a metric, like shortest paths).
+    n_obj = rng.randrange(1, 6)
+    n_drop = rng.randrange(1, 4)
+    n = 1 + n_obj + n_drop + 1
+    pts = [(rng.randrange(0, 2000), rng.randrange(0, 2000)) for _ in range(n)]
+    dist = [[abs(a[0] - b[0]) + abs(a[1] - b[1]) for b in pts] for a in pts]
+    objects = list(range(1, 1 + n_obj))
+    drops = list(range(1 + n_obj, 1 + n_obj + n_drop))
+    finish = n - 1 if rng.random() < 0.5 else -1
+
+    stops, total = plan_deliveries(dist, 0, objects, drops, finish, exact_max)
+    best = _brute_force(dist, 0, objects, drops, finish)
+    # Exact up to exact_max objects; the heuristic beyond it may only be longer.
+    if total < best or (n_obj <= exact_max and total != best):
+        raise AssertionError("plan_deliveries %d mm, brute force %d mm" % (total, best))
+    if _stops_cost(dist, 0, stops) != total:
+        raise AssertionError("stops cost %d mm, reported %d mm" % (_stops_cost(dist, 0, stops), total))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--mazes", type=int, default=300)
+    parser.add_argument("--max-junctions", type=int, default=8)
+    parser.add_argument("--object-prob", type=float, default=0.4)
+    parser.add_argument("--exact-max", type=int, default=7)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    for i in range(args.mazes):
+        try:
+            _check_maze(rng, rng.randrange(1, args.max_junctions + 1), args.object_prob, args.exact_max)
+            _check_deliveries(rng, args.exact_max)
+        except AssertionError as e:
+            print(f"case {i}: FAIL: {e}")
+            return 1
+    print(f"mazes={args.mazes} deliveries={args.mazes} OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
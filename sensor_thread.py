@@ -0,0 +1,230 @@
+"""
+Optional background sensor acquisition with double-buffered snapshots.
+
+A _thread worker samples the three color sensors every loop and the ultrasonic sensor
+at a lower rate. It fills the back buffer, then flips it to the front under a lock,
+so readers never block on a sensor and always see the latest complete sample.
+Each snapshot carries timestamps; readers take a maximum age and return STALE for
+older data, so callers can fall back to reading the sensor inline.
+
+No pybricks dependency: on a PC it runs against fake_devices (see __main__).
+
+All comments are intentionally in English (per user rule).
+"""
+
+import _thread
+
+try:
+    from time import sleep_ms, ticks_diff, ticks_ms
+except ImportError:
+    # CPython host.
+    from time import monotonic, sleep
+
+    def ticks_ms() -> int:
+        return int(monotonic() * 1000)
+
+    def ticks_diff(a: int, b: int) -> int:
+        return a - b
+
+    def sleep_ms(ms: int) -> None:
+        sleep(ms / 1000.0)
+
+
+# Returned by the readers when the latest sample is older than the allowed age.
+STALE = object()
+
+# Snapshot field indices.
+REF_L = 0
+REF_R = 1
+CENTER = 2
+DIST = 3
+T_COLOR = 4
+T_ULTRA = 5
+
+
+class SensorSampler:
+    def __init__(self, left_color, center_color, right_color, ultra, color_period_ms: int, ultra_period_ms: int):
+        self._left = left_color
+        self._center = center_color
+        self._right = right_color
+        self._ultra = ultra
+        self._color_period_ms = int(color_period_ms)
+        self._ultra_period_ms = int(ultra_period_ms)
+
+        # Two preallocated snapshots; the worker only ever writes the back one.
+        self._bufs = ([0, 0, None, None, 0, 0], [0, 0, None, None, 0, 0])
+        self._front = 0
+        self._lock = _thread.allocate_lock()
+
+        self._running = False
+        self._alive = False
+        self.samples = 0
+
+    # ------------------------------
+    # Worker
+    # ------------------------------
+
+    def start(self) -> None:
+        if self._running:
+            return
+        # Fill the first snapshot synchronously so readers never see empty data.
+        self._sample(True)
+        self._running = True
+        self._alive = True
+        _thread.start_new_thread(self._run, ())
+
+    def stop(self) -> None:
+        self._running = False
+        while self._alive:
+            sleep_ms(1)
+
+    def alive(self) -> bool:
+        return self._alive
+
+    def _sample(self, with_ultra: bool) -> None:
+        front = self._bufs[self._front]
+        back = self._bufs[1 - self._front]
+
+        back[REF_L] = self._left.reflection()
+        back[REF_R] = self._right.reflection()
+        back[CENTER] = self._center.color()
+        back[T_COLOR] = ticks_ms()
+
+        if with_ultra:
+            back[DIST] = self._ultra.distance()
+            back[T_ULTRA] = ticks_ms()
+        else:
+            back[DIST] = front[DIST]
+            back[T_ULTRA] = front[T_ULTRA]
+
+        with self._lock:
+            self._front = 1 - self._front
+        self.samples += 1
+
+    def _run(self) -> None:
+        # Fixed ultrasonic cadence: the deadline advances by the period, so the read latency
+        # and loop granularity do not add up from one sample to the next.
+        next_ultra = ticks_ms() + self._ultra_period_ms
+        try:
+            while self._running:
+                t0 = ticks_ms()
+                with_ultra = ticks_diff(t0, next_ultra) >= 0
+                if with_ultra:
+                    next_ultra += self._ultra_period_ms
+                    if ticks_diff(t0, next_ultra) >= 0:
+                        # Fell a whole period behind: resynchronize instead of bursting.
+                        next_ultra = t0 + self._ultra_period_ms
+                self._sample(with_ultra)
+                spent = ticks_diff(ticks_ms(), t0)
+                if spent < self._color_period_ms:
+                    sleep_ms(self._color_period_ms - spent)
+        finally:
+            self._alive = False
+
+    # ------------------------------
+    # Readers (never touch the sensors)
+    # ------------------------------
+
+    # The lock is only held for the flip and these field reads (never across sensor I/O),
+    # so readers cannot be handed a half-written buffer.
+
+    def reflections(self, max_age_ms: int):
+        # (left, right) from the latest sample, or STALE if it is older than max_age_ms.
+        with self._lock:
+            b = self._bufs[self._front]
+            if ticks_diff(ticks_ms(), b[T_COLOR]) > max_age_ms:
+                return STALE
+            return b[REF_L], b[REF_R]
+
+    def center_color(self, max_age_ms: int):
+        with self._lock:
+            b = self._bufs[self._front]
+            if ticks_diff(ticks_ms(), b[T_COLOR]) > max_age_ms:
+                return STALE
+            return b[CENTER]
+
+    def distance(self, max_age_ms: int):
+        with self._lock:
+            b = self._bufs[self._front]
+            if ticks_diff(ticks_ms(), b[T_ULTRA]) > max_age_ms:
+                return STALE
+            return b[DIST]
+
+    def color_age_ms(self) -> int:
+        with self._lock:
+            return ticks_diff(ticks_ms(), self._bufs[self._front][T_COLOR])
+
+    def ultra_age_ms(self) -> int:
+        with self._lock:
+            return ticks_diff(ticks_ms(), self._bufs[self._front][T_ULTRA])
+
+
+if __name__ == "__main__":
+    # Host check against fake sensors with EV3-like latency. Exits 1 if a check fails:
+    # - readers never wait for a sensor (each read is far below the sensor latency),
+    # - color data never gets older than the stale limit,
+    # - the ultrasonic is sampled about every --ultra-period-ms.
+    import argparse
+    import sys
+    from time import perf_counter
+
+    from fake_devices import FakeColorSensor, FakeUltrasonicSensor
+
+    parser = argparse.ArgumentParser(description="Check SensorSampler against fake sensors.")
+    parser.add_argument("--color-latency-ms", type=float, default=3.0)
+    parser.add_argument("--ultra-latency-ms", type=float, default=15.0)
+    parser.add_argument("--color-period-ms", type=int, default=2)
+    parser.add_argument("--ultra-period-ms", type=int, default=50)
+    # Same default as config.SENSOR_STALE_MS (config needs pybricks, so it is not imported).
+    parser.add_argument("--stale-ms", type=int, default=40)
+    parser.add_argument("--run-ms", type=int, default=1000)
+    args = parser.parse_args()
+
+    left = FakeColorSensor(args.color_latency_ms, reflection=10)
+    center = FakeColorSensor(args.color_latency_ms)
+    right = FakeColorSensor(args.color_latency_ms, reflection=90)
+    ultra = FakeUltrasonicSensor(args.ultra_latency_ms, distance=300)
+
+    sampler = SensorSampler(left, center, right, ultra, args.color_period_ms, args.ultra_period_ms)
+    sampler.start()
+
+    max_read_ms = 0.0
+    max_color_age = 0
+    stale_reads = 0
+    ultra_updates = 0
+    last_ultra_age = sampler.ultra_age_ms()
+    reads = 0
+    t_end = ticks_ms() + args.run_ms
+    while ticks_diff(t_end, ticks_ms()) > 0:
+        t0 = perf_counter()
+        r = sampler.reflections(args.stale_ms)
+        d = sampler.distance(args.ultra_period_ms + args.stale_ms)
+        max_read_ms = max(max_read_ms, (perf_counter() - t0) * 1000.0)
+        if r is STALE or d is STALE:
+            stale_reads += 1
+        max_color_age = max(max_color_age, sampler.color_age_ms())
+        ultra_age = sampler.ultra_age_ms()
+        if ultra_age < last_ultra_age:
+            ultra_updates += 1
+        last_ultra_age = ultra_age
+        reads += 1
+        sleep_ms(5)
+
+    sampler.stop()
+    ultra_interval = args.run_ms / max(1, ultra_updates)
+    # One worker loop (3 color reads + period) plus one ultrasonic read may delay a sample.
+    slack = 3 * args.color_latency_ms + args.color_period_ms + args.ultra_latency_ms + 10
+    print(f"samples={sampler.samples} reads={reads} max_read_ms={max_read_ms:.2f} stale_reads={stale_reads}")
+    print(f"max_color_age_ms={max_color_age} ultra_interval_ms={ultra_interval:.1f}")
+
+    failures = []
+    if max_read_ms >= args.color_latency_ms / 2:
+        failures.append("reads blocked on sensor latency")
+    if max_color_age > args.stale_ms or stale_reads:
+        failures.append("color data went stale")
+    if not (0.9 * args.ultra_period_ms <= ultra_interval <= args.ultra_period_ms + slack):
+        failures.append("ultrasonic not sampled at about --ultra-period-ms")
+    for f in failures:
+        print("FAIL: " + f)
+    print("FAIL" if failures else "OK")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,84 @@
+"""
+Speed profile for corridors whose length is known from the map.
+
+Trapezoid-like profile with a constant acceleration limit: ramp up from base speed
+after leaving a vertex, cap at max speed, and ramp down so the robot is back at base
+speed `margin_mm` before the expected junction (where detection runs as usual).
+
+No pybricks dependency.
+
+All comments are intentionally in English (per user rule).
+"""
+
+from math import sqrt
+
+
+def corridor_speed(traveled: int, remaining: int, base: int, vmax: int, accel: int, margin_mm: int) -> int:
+    """
+    Speed (mm/s) at a point of a known corridor.
+    remaining <= 0 means unknown length or already past the recorded end: base speed.
+    """
+    if remaining <= 0 or vmax <= base:
+        return base
+    # v^2 = v0^2 + 2*a*d for both the ramp up and the ramp down.
+    up = sqrt(base * base + 2.0 * accel * max(0, traveled))
+    down = sqrt(base * base + 2.0 * accel * max(0, remaining - margin_mm))
+    return int(min(vmax, up, down))
+
+
+if __name__ == "__main__":
+    # Host check: drive simulated corridors tick by tick with the profile. Exits 1 if a check fails:
+    # - base speed for unknown lengths and within margin_mm of the recorded end,
+    # - never above vmax (nor below base),
+    # - speed changes per tick stay within the accel ramp, and long corridors reach vmax.
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Check corridor_speed on simulated corridors.")
+    # Same defaults as config (config needs pybricks, so it is not imported):
+    # BASE_SPEED, PROFILE_MAX_SPEED, DRIVE_STRAIGHT_ACCEL, PROFILE_BRAKE_MARGIN_MM, CONTROL_LOOP_MS.
+    parser.add_argument("--base", type=int, default=140)
+    parser.add_argument("--vmax", type=int, default=320)
+    parser.add_argument("--accel", type=int, default=400)
+    parser.add_argument("--margin-mm", type=int, default=120)
+    parser.add_argument("--tick-ms", type=int, default=10)
+    args = parser.parse_args()
+
+    base = args.base
+    dt = args.tick_ms / 1000.0
+    # dv/dt = accel on the ramps. Slack: discrete ticks, int speeds and the 1 mm odometer
+    # resolution (one extra mm changes v by up to accel / base).
+    max_step = args.accel * dt * 1.1 + args.accel / float(base) + 1
+
+    failures = []
+    for length in (0, -50, 60, args.margin_mm, 200, 500, 1000, 2000, 4000):
+        traveled = 0.0
+        prev = base
+        top = base
+        while traveled < max(length, 300):
+            v = corridor_speed(int(traveled), length - int(traveled), base, args.vmax, args.accel, args.margin_mm)
+            if (length <= 0 or length - int(traveled) <= args.margin_mm) and v != base:
+                failures.append(f"length={length} traveled={traveled:.0f}: {v} mm/s, expected base")
+                break
+            if v > args.vmax or v < base:
+                failures.append(f"length={length} traveled={traveled:.0f}: {v} mm/s outside [base, vmax]")
+                break
+            if abs(v - prev) > max_step:
+                failures.append(f"length={length} traveled={traveled:.0f}: {prev} -> {v} mm/s exceeds accel")
+                break
+            top = max(top, v)
+            prev = v
+            traveled += v * dt
+        # Room to ramp up to vmax and back down before the margin.
+        ramp_mm = (args.vmax * args.vmax - base * base) / (2.0 * args.accel)
+        if length >= 2 * ramp_mm + args.margin_mm and top != args.vmax:
+            failures.append(f"length={length}: top speed {top} mm/s never reached vmax")
+        print(f"length={length:5d} top={top}")
+
+    if corridor_speed(100, 1000, base, base - 10, args.accel, args.margin_mm) != base:
+        failures.append("vmax <= base must give base")
+
+    for f in failures:
+        print("FAIL: " + f)
+    print("FAIL" if failures else "OK")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,216 @@
+"""
+Host-side device-call budget profiler for one control tick of main.py.
+
+Runs main.main() unmodified against instrumented fake pybricks devices
+(fake_devices.install_fake_pybricks) on a straight line, counts device calls
+per method per tick and measures per-tick CPU time. A tick is one iteration of the
+main loop, delimited by its buttons.pressed() call.
+
+With --speed-profile, ENABLE_ROUTE_PLAN and ENABLE_SPEED_PROFILE are turned on and a
+short scripted mapping run (_ROUTE_SCRIPT) comes first; only the line-following ticks
+of the planned route that follows are measured.
+
+Exits with status 1 when any per-tick maximum exceeds TICK_BUDGET or the average
+CPU time exceeds TICK_CPU_BUDGET_US.
+
+Run with CPython on a PC:
+    python tick_profiler.py --ticks 2000
+    python tick_profiler.py --budget reflection=2
+    python tick_profiler.py --speed-profile
+
+All comments are intentionally in English (per user rule).
+"""
+
+import argparse
+import sys
+import time
+
+from fake_devices import FakeWorld, install_fake_pybricks
+
+# Maximum device calls allowed in a single line-following tick.
+TICK_BUDGET = {
+    "reflection": 4,
+    "color": 3,
+    "distance": 1,
+    "buttons.pressed": 1,
+    "drive.drive": 1,
+    "drive.distance": 1,
+}
+
+# Average Python work per tick (host CPU, microseconds).
+TICK_CPU_BUDGET_US = 100
+
+# Mapping run before the measured route ticks: (event, line ticks before it).
+# One + junction: right to RED, straight to GREEN, left to RED; exploration then ends at
+# the junction and the planned route to GREEN starts down the long straight corridor.
+_ROUTE_SCRIPT = (
+    ("junction", 100),
+    ("red", 300),
+    ("junction", 300),
+    ("green", 600),
+    ("junction", 600),
+    ("red", 300),
+    ("junction", 300),
+)
+
+# Ticks to wait for main.py to handle a scripted event before giving up.
+_EVENT_TIMEOUT_TICKS = 200
+
+
+class _TickRecorder:
+    """
+    Drives the fake buttons: presses CENTER to start, then marks a tick boundary on
+    every main-loop buttons.pressed() call and presses LEFT+RIGHT after `ticks` ticks.
+    Scripted events (see _ROUTE_SCRIPT) are played first; ticks are measured after them.
+    """
+
+    def __init__(self, world: FakeWorld, button, color, ticks: int, script=()):
+        self._world = world
+        self._button = button
+        self._color = color
+        self._ticks = int(ticks)
+        self._calls = 0
+        self._t0 = 0.0
+        self._script = list(script)
+        self._event = None
+        self._wait = 0
+        self._measuring = False
+        self.stuck = None
+        self.counts = []
+        self.cpu_us = []
+
+    def __call__(self):
+        self._calls += 1
+        # Calls 1 and 2 are wait_for_center_press (press, then release).
+        if self._calls == 1:
+            return [self._button.CENTER]
+        if self._calls == 2:
+            return []
+
+        now = time.process_time()
+        if self._measuring:
+            self.counts.append(self._world.counter.counts)
+            self.cpu_us.append((now - self._t0) * 1e6)
+        else:
+            self._measuring = self._advance(self._world.counter.counts)
+        self._world.counter.reset()
+
+        if len(self.counts) >= self._ticks or self.stuck is not None:
+            return [self._button.LEFT, self._button.RIGHT]
+        self._t0 = time.process_time()
+        return []
+
+    def _advance(self, counts) -> bool:
+        # Play the script; returns True once it is over and ticks should be measured.
+        if self._event is not None:
+            # Every scripted event ends with a maneuver (straight() or turn()).
+            if "drive.straight" not in counts and "drive.turn" not in counts:
+                self._wait += 1
+                if self._wait > _EVENT_TIMEOUT_TICKS:
+                    self.stuck = self._event
+                return False
+            _line_world(self._world, self._color)
+            self._event = None
+            self._wait = 0
+        if not self._script:
+            return True
+        event, gap = self._script[0]
+        if self._wait < gap:
+            self._wait += 1
+            return False
+        self._script.pop(0)
+        self._event = event
+        self._wait = 0
+        _event_world(self._world, self._color, event)
+        return False
+
+
+def _line_world(world: FakeWorld, color) -> None:
+    # Robot centered on a straight line: sides on white, center on black, nothing ahead.
+    world.reflections = {"S1": 70, "S3": 70}
+    world.colors = {"S1": color.WHITE, "S2": color.BLACK, "S3": color.WHITE}
+    world.distance = 2550
+
+
+def _event_world(world: FakeWorld, color, event: str) -> None:
+    if event == "junction":
+        # All three sensors on black.
+        world.reflections = {"S1": 10, "S3": 10}
+        world.colors = {"S1": color.BLACK, "S2": color.BLACK, "S3": color.BLACK}
+    else:
+        world.colors["S2"] = color.RED if event == "red" else color.GREEN
+
+
+def profile(ticks: int, speed_profile: bool = False):
+    world = FakeWorld()
+    install_fake_pybricks(world)
+
+    from pybricks.parameters import Button, Color
+
+    import config
+    import main
+
+    script = ()
+    if speed_profile:
+        config.ENABLE_ROUTE_PLAN = True
+        config.ENABLE_SPEED_PROFILE = True
+        script = _ROUTE_SCRIPT
+
+    _line_world(world, Color)
+    rec = _TickRecorder(world, Button, Color, ticks, script)
+    world.on_buttons = rec
+    main.main()
+    return rec.counts, rec.cpu_us, rec.stuck
+
+
+def _parse_budget(items):
+    budget = dict(TICK_BUDGET)
+    for item in items:
+        name, _, value = item.partition("=")
+        budget[name] = int(value)
+    return budget
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Profile device calls and CPU time per main-loop tick.")
+    parser.add_argument("--ticks", type=int, default=1000)
+    parser.add_argument("--budget", action="append", default=[], metavar="METHOD=N")
+    parser.add_argument("--cpu-budget-us", type=float, default=TICK_CPU_BUDGET_US)
+    parser.add_argument("--speed-profile", action="store_true", help="measure route ticks with ENABLE_SPEED_PROFILE")
+    args = parser.parse_args(argv)
+
+    budget = _parse_budget(args.budget)
+    counts, cpu_us, stuck = profile(args.ticks, args.speed_profile)
+    if stuck is not None:
+        print(f"scripted mapping run stuck at event '{stuck}'")
+        return 1
+    if not counts:
+        print("no ticks recorded")
+        return 1
+
+    names = sorted(set(budget) | set(k for c in counts for k in c))
+    failed = False
+    print(f"ticks={len(counts)}")
+    print(f"{'method':18s} {'avg':>6s} {'max':>4s} {'budget':>6s}")
+    for name in names:
+        per_tick = [c.get(name, 0) for c in counts]
+        avg = sum(per_tick) / len(per_tick)
+        mx = max(per_tick)
+        limit = budget.get(name)
+        over = limit is not None and mx > limit
+        failed = failed or over
+        print(f"{name:18s} {avg:6.2f} {mx:4d} {'-' if limit is None else limit:>6} {'OVER' if over else ''}")
+
+    cpu_sorted = sorted(cpu_us)
+    cpu_avg = sum(cpu_us) / len(cpu_us)
+    cpu_p95 = cpu_sorted[int(0.95 * (len(cpu_sorted) - 1))]
+    cpu_over = cpu_avg > args.cpu_budget_us
+    failed = failed or cpu_over
+    print(f"cpu_us avg={cpu_avg:.1f} p95={cpu_p95:.1f} max={cpu_sorted[-1]:.1f} budget={args.cpu_budget_us:g} {'OVER' if cpu_over else ''}")
+
+    print("FAIL" if failed else "OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())